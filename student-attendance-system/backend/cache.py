@@ -0,0 +1,97 @@
+"""
+In-process query caches for Student Attendance System
+
+Each process keeps its own cached results. Coherence across processes and
+hosts is kept through the cache_versions table: committed writes bump
+the version of the data they touched, and a cached entry is only served
+while the versions it was built against are unchanged. Versions are
+re-read at most every CACHE_VERSION_POLL_SECONDS (and right after a write
+in this process), and entries expire after a TTL (CACHE_TTL_SECONDS by
+default), which also bounds staleness for writes that do not bump a
+version (barcode scans) and changes made outside the app (manual SQL).
+"""
+import threading
+import time
+import sys
+import os
+
+# Add parent directory to path to import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import Config
+
+
+# Data sets that cached entries can depend on
+NAMESPACES = ('students', 'attendance')
+
+
+class CacheVersions:
+    """Version stamps for each cache namespace, read from the database"""
+
+    # Callable returning {namespace: version}; set by models.py
+    fetch = None
+
+    _versions = None
+    _fetched_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def snapshot(cls, namespaces):
+        """Get the stamps of namespaces, or None if they cannot be read"""
+        with cls._lock:
+            versions = cls._versions
+            fresh = time.monotonic() - cls._fetched_at < Config.CACHE_VERSION_POLL_SECONDS
+
+        if versions is None or not fresh:
+            try:
+                versions = cls.fetch()
+            except Exception as e:
+                print(f"✗ Could not read cache versions: {e}")
+                return None
+            with cls._lock:
+                cls._versions = versions
+                cls._fetched_at = time.monotonic()
+
+        return tuple(versions.get(ns, 0) for ns in namespaces)
+
+    @classmethod
+    def expire(cls):
+        """Re-read the stamps on next use (after a write in this process)"""
+        with cls._lock:
+            cls._versions = None
+
+
+class QueryCache:
+    """Cache of query results keyed by name and dependency stamps"""
+
+    _entries = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_or_load(cls, key, namespaces, loader, ttl=None):
+        """Return the cached value for key, calling loader on a miss
+        
+        Entries are served for ttl seconds (default: CACHE_TTL_SECONDS).
+        """
+        if ttl is None:
+            ttl = Config.CACHE_TTL_SECONDS
+        # Read the stamps before loading so a write that lands during the
+        # load leaves the entry stale instead of hiding the change
+        stamp = CacheVersions.snapshot(namespaces)
+        if stamp is None:
+            return loader()
+
+        with cls._lock:
+            entry = cls._entries.get(key)
+        if entry and entry[0] == stamp and time.monotonic() - entry[2] < ttl:
+            return entry[1]
+
+        value = loader()
+        with cls._lock:
+            cls._entries[key] = (stamp, value, time.monotonic())
+        return value
+
+    @classmethod
+    def clear(cls):
+        """Drop this process's cached entries"""
+        with cls._lock:
+            cls._entries.clear()
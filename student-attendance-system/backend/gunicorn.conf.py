@@ -0,0 +1,56 @@
+"""
+Gunicorn configuration for Student Attendance System
+
+    gunicorn -c backend/gunicorn.conf.py
+
+Runs WORKERS worker processes with WORKER_THREADS threads each (gthread
+workers). Each worker opens its own database connection pools after it is
+forked, with two connections per thread, since a request can hold its own
+session and a cache loader's session at the same time. In-process caches
+stay coherent through the version stamps described in cache.py.
+"""
+import os
+import sys
+
+from mysql.connector.pooling import CNX_POOL_MAXSIZE
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+
+
+# Connections per request thread (request session + cache loader session)
+CONNECTIONS_PER_THREAD = 2
+
+wsgi_app = 'app:app'
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+bind = f'{Config.HOST}:{Config.PORT}'
+
+worker_class = 'gthread'
+workers = max(1, Config.WORKERS)
+threads = max(1, Config.WORKER_THREADS)
+if threads > CNX_POOL_MAXSIZE // CONNECTIONS_PER_THREAD:
+    print(f"✗ WORKER_THREADS={threads} needs more than {CNX_POOL_MAXSIZE} pooled "
+          f"connections, using {CNX_POOL_MAXSIZE // CONNECTIONS_PER_THREAD} threads")
+    threads = CNX_POOL_MAXSIZE // CONNECTIONS_PER_THREAD
+
+# Open client connections per worker (including keep-alive ones); further
+# connections wait in the listen backlog instead of piling up in a worker
+worker_connections = threads * 4
+backlog = 256
+keepalive = 2
+
+# Workers that stop responding are killed and replaced, and shutdown waits
+# at most graceful_timeout for running requests
+timeout = 30
+graceful_timeout = 30
+
+# The app (and the database pools models.py opens on import) is loaded in
+# each worker after the fork, never shared with the master
+preload_app = False
+
+
+def post_fork(server, worker):
+    """Size the worker's connection pools for its threads"""
+    Config.DB_POOL_SIZE = threads * CONNECTIONS_PER_THREAD
@@ -0,0 +1,57 @@
+"""
+Scheduled jobs for Student Attendance System
+
+Run from cron, for example at the end of each school day:
+
+    55 23 * * 1-5  cd /path/to/student-attendance-system && python backend/jobs.py mark-absences
+
+and once a year, after the new academic year has started:
+
+    0 2 1 7 *  cd /path/to/student-attendance-system && python backend/jobs.py archive
+"""
+import argparse
+from datetime import datetime
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Attendance
+
+
+def mark_absences(args):
+    """Mark every student without a scan as absent"""
+    target_date = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else None
+    result = Attendance.mark_absences(target_date)
+    print(f"✓ {result['date']}: marked {result['marked_absent']} students absent "
+          f"across {result['classes']} classes")
+
+
+def archive(args):
+    """Move closed academic years into the archive table"""
+    before = datetime.strptime(args.before, '%Y-%m-%d').date() if args.before else None
+    result = Attendance.archive(before)
+    print(f"✓ Moved {result['moved']} attendance records dated before "
+          f"{result['archived_before']} to the archive")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Student Attendance System jobs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    absences = commands.add_parser('mark-absences', help='mark unscanned students absent')
+    absences.add_argument('--date', help='date to close (YYYY-MM-DD, default: today)')
+    absences.set_defaults(handler=mark_absences)
+
+    archiving = commands.add_parser('archive', help='archive attendance from closed academic years')
+    archiving.add_argument('--before', help='archive records before this date '
+                                            '(YYYY-MM-DD, default: start of the academic year)')
+    archiving.set_defaults(handler=archive)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Schema migration runner for Student Attendance System
+
+Migrations are the numbered SQL files in database/migrations/
+(NNN_description.sql). Applied versions are recorded in the
+schema_migrations table, so running the command again only applies new
+files:
+
+    python backend/migrate.py            # apply pending migrations
+    python backend/migrate.py status     # list applied and pending migrations
+
+Migrations run against a live database. Write schema changes as online
+DDL (ALGORITHM=INPLACE, LOCK=NONE). MySQL commits each DDL statement on
+its own and the version is recorded only after the whole file has run, so
+a file may contain at most one statement that cannot be repeated (ALTER,
+DROP, RENAME, CREATE INDEX); every other statement must be safe to run
+again (CREATE ... IF NOT EXISTS, CREATE OR REPLACE VIEW, INSERT IGNORE).
+A failed migration then leaves nothing behind that blocks a re-run. DDL
+still needs a short metadata lock; the runner gives up after
+--lock-wait-timeout seconds instead of queueing scans behind a
+long-running transaction.
+"""
+import argparse
+import os
+import re
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'database',
+    'migrations'
+)
+MIGRATION_FILE = re.compile(r'^(\d+)_\w+\.sql$')
+# Statements that fail if run a second time
+NON_REPEATABLE = re.compile(r'^(ALTER|DROP|RENAME|CREATE\s+(UNIQUE\s+)?INDEX)\b', re.IGNORECASE)
+
+
+def connect(database=None):
+    """Open a plain (non-pooled) connection for schema changes"""
+    db_config = Config.get_db_config()
+    for key in ('pool_name', 'pool_size'):
+        db_config.pop(key)
+    if database is not None:
+        db_config['database'] = database
+    return mysql.connector.connect(**db_config)
+
+
+def load_migrations():
+    """Return (version, name, path) for each migration file, in order"""
+    migrations = []
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(name)
+        if match:
+            migrations.append((int(match.group(1)), name, os.path.join(MIGRATIONS_DIR, name)))
+    return migrations
+
+
+def split_statements(sql):
+    """Split a migration file into statements, dropping comment lines"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    statements = re.split(r';\s*$', '\n'.join(lines), flags=re.MULTILINE)
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def check_repeatable(name, statements):
+    """Refuse a migration that could fail halfway through and not re-run"""
+    non_repeatable = [s for s in statements if NON_REPEATABLE.match(s)]
+    if len(non_repeatable) > 1:
+        raise ValueError(
+            f"{name} has {len(non_repeatable)} non-repeatable statements; "
+            "split it into one migration per ALTER/DROP/RENAME/CREATE INDEX"
+        )
+
+
+def get_applied(connection):
+    """Return the set of applied versions, creating the tracking table if needed"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SHOW TABLES LIKE 'schema_migrations'")
+        exists = cursor.fetchone() is not None
+
+        if not exists:
+            cursor.execute("""
+                CREATE TABLE schema_migrations (
+                    version INT PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+            # Databases created from the original schema.sql already have
+            # the initial schema: record it instead of running it again
+            cursor.execute("SHOW TABLES LIKE 'students'")
+            if cursor.fetchone() is not None:
+                version, name, _ = load_migrations()[0]
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (version, name)
+                )
+                print(f"✓ Existing schema recorded as {name}")
+            connection.commit()
+
+        cursor.execute("SELECT version FROM schema_migrations")
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def migrate(connection, lock_wait_timeout=5):
+    """Apply all pending migrations in order and return how many ran"""
+    applied = get_applied(connection)
+    pending = []
+    for version, name, path in load_migrations():
+        if version not in applied:
+            with open(path) as migration_file:
+                statements = split_statements(migration_file.read())
+            # Check every file before changing anything
+            check_repeatable(name, statements)
+            pending.append((version, name, statements))
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SET SESSION lock_wait_timeout = %s", (lock_wait_timeout,))
+        for version, name, statements in pending:
+            print(f"→ Applying {name}")
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                (version, name)
+            )
+            connection.commit()
+            print(f"✓ Applied {name}")
+    finally:
+        cursor.close()
+
+    return len(pending)
+
+
+def status(args):
+    connection = connect()
+    try:
+        applied = get_applied(connection)
+        for version, name, _ in load_migrations():
+            state = 'applied' if version in applied else 'pending'
+            print(f"{state:>8}  {name}")
+    finally:
+        connection.close()
+
+
+def up(args):
+    connection = connect()
+    try:
+        count = migrate(connection, args.lock_wait_timeout)
+        if not count:
+            print("✓ Database schema is up to date")
+    except (Error, ValueError) as e:
+        print(f"✗ Migration failed: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Student Attendance System schema migrations')
+    parser.add_argument('--lock-wait-timeout', type=int, default=5,
+                        help='seconds to wait for metadata locks (default: 5)')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('up', help='apply pending migrations (default)').set_defaults(handler=up)
+    commands.add_parser('status', help='list migrations').set_defaults(handler=status)
+
+    args = parser.parse_args()
+    getattr(args, 'handler', up)(args)
+
+
+if __name__ == '__main__':
+    main()
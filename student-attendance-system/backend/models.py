@@ -2,67 +2,368 @@
 Database models and operations for Student Attendance System
 """
 import mysql.connector
-from mysql.connector import Error, pooling
+from mysql.connector import Error, errors, pooling
+from contextlib import contextmanager
 from datetime import datetime, date
+import threading
+import time
 import sys
 import os
 
 # Add parent directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.config import Config
+from cache import CacheVersions, NAMESPACES, QueryCache
+
+
+def academic_year_start(day):
+    """First day of the academic year that contains day"""
+    start = date(day.year, Config.ACADEMIC_YEAR_START_MONTH, 1)
+    if day < start:
+        start = date(day.year - 1, Config.ACADEMIC_YEAR_START_MONTH, 1)
+    return start
 
 
 class Database:
-    """Database connection handler using connection pooling"""
+    """Database connection handler using connection pooling
+    
+    Writes always go to the primary pool. Queries executed with
+    read_only=True go to a read replica when one is configured and healthy,
+    unless the current thread is inside a use_primary() block.
+    """
     
     _connection_pool = None
+    _replicas = []
+    _replica_cursor = 0
+    _routing_lock = threading.Lock()
+    _routing_stats = {'primary': 0, 'replica': 0, 'fallback': 0}
+    _local = threading.local()
     
     @classmethod
     def initialize_pool(cls):
-        """Initialize connection pool"""
+        """Initialize primary and replica connection pools"""
         try:
-            cls._connection_pool = pooling.MySQLConnectionPool(
-                **Config.get_db_config()
-            )
+            cls._connection_pool = pooling.MySQLConnectionPool(**Config.get_db_config())
             print("✓ Database connection pool created successfully")
         except Error as e:
             print(f"✗ Error creating connection pool: {e}")
             raise
+        
+        cls._replicas = []
+        for replica_config in Config.get_replica_configs():
+            replica = {
+                'name': f"{replica_config['host']}:{replica_config['port']}",
+                'config': replica_config,
+                'pool': None,
+                'down_until': 0,
+                'lag': None,
+                'lag_checked_at': 0
+            }
+            cls._replicas.append(replica)
+            cls._open_replica(replica)
+    
+    @classmethod
+    def _open_replica(cls, replica):
+        """Create a replica pool, marking the replica down on failure"""
+        try:
+            replica['pool'] = pooling.MySQLConnectionPool(**replica['config'])
+            print(f"✓ Replica pool created for {replica['name']}")
+            return True
+        except Error as e:
+            cls._mark_replica_down(replica, e)
+            return False
+    
+    @classmethod
+    def _mark_replica_down(cls, replica, error):
+        replica['down_until'] = time.monotonic() + Config.DB_REPLICA_RETRY_SECONDS
+        # Check lag again as soon as the replica is retried
+        replica['lag_checked_at'] = 0
+        print(f"✗ Replica {replica['name']} unavailable, using primary: {error}")
+    
+    @classmethod
+    def _replica_lag_ok(cls, replica, connection):
+        """Check replication lag at most every DB_REPLICA_LAG_CHECK_SECONDS"""
+        now = time.monotonic()
+        if now - replica['lag_checked_at'] < Config.DB_REPLICA_LAG_CHECK_SECONDS:
+            return True
+        replica['lag_checked_at'] = now
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except errors.ProgrammingError:
+                # MySQL before 8.0.22
+                cursor.execute("SHOW SLAVE STATUS")
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        
+        status = rows[0] if rows else {}
+        lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+        replica['lag'] = lag
+        if lag is None:
+            cls._mark_replica_down(replica, "replication is not running")
+            return False
+        if lag > Config.DB_REPLICA_MAX_LAG_SECONDS:
+            cls._mark_replica_down(replica, f"{lag}s behind the primary")
+            return False
+        return True
+    
+    @staticmethod
+    def _release(connection):
+        """Return a pooled connection, ignoring errors from a broken one"""
+        try:
+            connection.close()
+        except Error:
+            pass
+    
+    @classmethod
+    @contextmanager
+    def use_primary(cls):
+        """Route every query in this block to the primary (read-your-writes)"""
+        cls._local.primary_depth = getattr(cls._local, 'primary_depth', 0) + 1
+        try:
+            yield
+        finally:
+            cls._local.primary_depth -= 1
     
     @classmethod
-    def get_connection(cls):
+    def get_connection(cls, read_only=False):
         """Get connection from pool"""
         if cls._connection_pool is None:
             cls.initialize_pool()
+        
+        if read_only and cls._replicas and not getattr(cls._local, 'primary_depth', 0):
+            connection = cls._get_replica_connection()
+            if connection is not None:
+                cls._record_route('replica')
+                return connection
+            cls._record_route('fallback')
+        else:
+            cls._record_route('primary')
         return cls._connection_pool.get_connection()
     
     @classmethod
-    def execute_query(cls, query, params=None, fetch=True):
-        """Execute a query and return results"""
-        connection = None
-        cursor = None
-        try:
-            connection = cls.get_connection()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
+    def _get_replica_connection(cls):
+        """Get a connection from the next healthy replica, or None"""
+        with cls._routing_lock:
+            start = cls._replica_cursor
+            cls._replica_cursor += 1
+        
+        now = time.monotonic()
+        for offset in range(len(cls._replicas)):
+            replica = cls._replicas[(start + offset) % len(cls._replicas)]
+            if replica['down_until'] > now:
+                continue
+            if replica['pool'] is None and not cls._open_replica(replica):
+                continue
+            try:
+                # The pool pings the connection and reconnects if needed
+                connection = replica['pool'].get_connection()
+            except errors.PoolError:
+                # Busy, not broken: try the next replica
+                continue
+            except Error as e:
+                cls._mark_replica_down(replica, e)
+                continue
             
-            if fetch:
-                result = cursor.fetchall()
-                return result
-            else:
-                connection.commit()
-                return cursor.lastrowid
-                
+            try:
+                if cls._replica_lag_ok(replica, connection):
+                    return connection
+            except Error as e:
+                cls._mark_replica_down(replica, e)
+            cls._release(connection)
+        return None
+    
+    @classmethod
+    def _record_route(cls, target):
+        with cls._routing_lock:
+            cls._routing_stats[target] += 1
+    
+    @classmethod
+    def get_routing_stats(cls):
+        """Get query routing counters and replica health"""
+        now = time.monotonic()
+        with cls._routing_lock:
+            stats = dict(cls._routing_stats)
+        stats['replicas'] = [
+            {
+                'name': replica['name'],
+                'healthy': replica['down_until'] <= now and replica['pool'] is not None,
+                'lag_seconds': replica['lag']
+            }
+            for replica in cls._replicas
+        ]
+        return stats
+    
+    @classmethod
+    @contextmanager
+    def session(cls, read_only=False, join=True, publish=True):
+        """Open a unit of work on one pooled connection
+        
+        Everything executed inside the block shares a connection and a
+        transaction, which is committed when the block exits cleanly and
+        rolled back otherwise. A session opened while another is active on
+        the same thread joins the outer one, unless join is False.
+        
+        publish=False keeps the session out of the thread's current session,
+        so nothing joins it. Use it for sessions that stay open while other
+        code runs on the thread, such as a paused generator streaming rows
+        (its connection still has unread results).
+        """
+        current = getattr(cls._local, 'session', None)
+        if current is not None and join:
+            if current.read_only and not read_only:
+                raise RuntimeError("Cannot write inside a read-only session")
+            yield current
+            return
+        
+        session = Session(cls.get_connection(read_only=read_only), read_only)
+        if publish:
+            cls._local.session = session
+        try:
+            yield session
+            session.commit()
         except Error as e:
             print(f"Database error: {e}")
-            if connection:
-                connection.rollback()
+            session.rollback()
+            raise
+        except BaseException:
+            session.rollback()
             raise
         finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                connection.close()
+            if publish:
+                cls._local.session = current
+            session.close()
+    
+    @classmethod
+    def execute_query(cls, query, params=None, fetch=True, read_only=False):
+        """Execute a query and return results"""
+        with cls.session(read_only=read_only and fetch) as session:
+            if fetch:
+                return session.query(query, params)
+            return session.execute(query, params)
+
+
+class Session:
+    """Unit of work bound to a single database connection"""
+    
+    def __init__(self, connection, read_only=False):
+        self.connection = connection
+        self.read_only = read_only
+        self.rowcount = 0
+        self._cursor = connection.cursor(dictionary=True)
+        self._prepared = {}
+        self._pending_invalidations = set()
+    
+    def _get_cursor(self, query, prepared):
+        if not prepared:
+            return self._cursor
+        # Prepared statements live on the connection and are released when
+        # the session ends, so they only pay off for a statement run many
+        # times in one session (the per-class and per-month loops of the
+        # jobs); reuse one cursor per statement
+        if query not in self._prepared:
+            self._prepared[query] = self.connection.cursor(prepared=True, dictionary=True)
+        return self._prepared[query]
+    
+    def query(self, query, params=None, prepared=False):
+        """Run a SELECT and return all rows as dictionaries"""
+        cursor = self._get_cursor(query, prepared)
+        cursor.execute(query, params or ())
+        return cursor.fetchall()
+    
+    def query_one(self, query, params=None, prepared=False):
+        """Run a SELECT and return the first row, or None"""
+        result = self.query(query, params, prepared)
+        return result[0] if result else None
+    
+    def execute(self, query, params=None, prepared=False):
+        """Run a write statement and return the last inserted ID"""
+        cursor = self._get_cursor(query, prepared)
+        cursor.execute(query, params or ())
+        self.rowcount = cursor.rowcount
+        return cursor.lastrowid
+    
+    def executemany(self, query, seq_params):
+        """Run a write statement for each parameter set in one batch
+        
+        Plain INSERT ... VALUES statements are sent as a single multi-row
+        INSERT. Returns the number of affected rows.
+        """
+        self._cursor.executemany(query, seq_params)
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+    
+    def stream(self, query, params=None, batch_size=500):
+        """Yield rows from an unbuffered cursor without loading the full result
+        
+        The rows must be consumed before running another statement in the
+        same session. If iteration stops early, the rest of the result is
+        read and discarded so the connection stays usable.
+        """
+        cursor = self.connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            if self.connection.unread_result:
+                while cursor.fetchmany(batch_size):
+                    pass
+            cursor.close()
+    
+    def invalidate(self, *namespaces):
+        """Invalidate cache namespaces once the transaction commits"""
+        self._pending_invalidations.update(namespaces)
+    
+    def commit(self):
+        """Commit the current transaction"""
+        self.connection.commit()
+        if self._pending_invalidations:
+            namespaces = sorted(self._pending_invalidations)
+            self._pending_invalidations.clear()
+            self._bump_cache_versions(namespaces)
+    
+    def _bump_cache_versions(self, namespaces):
+        """Tell every process that cached data in namespaces changed
+        
+        Runs after the data is committed, in a transaction of its own so the
+        version rows are only locked for a moment. A failure here must not
+        fail the write: other processes then see the change once their
+        entries expire (CACHE_TTL_SECONDS), and this process drops its own.
+        """
+        placeholders = ', '.join(['%s'] * len(namespaces))
+        try:
+            self._cursor.execute(
+                f"UPDATE cache_versions SET version = version + 1 WHERE namespace IN ({placeholders})",
+                namespaces
+            )
+            self.connection.commit()
+        except Error as e:
+            print(f"✗ Could not bump cache versions ({', '.join(namespaces)}): {e}")
+            try:
+                self.connection.rollback()
+            except Error:
+                pass
+            QueryCache.clear()
+        CacheVersions.expire()
+    
+    def rollback(self):
+        """Roll back the current transaction"""
+        self.connection.rollback()
+        self._pending_invalidations.clear()
+    
+    def close(self):
+        """Close cursors and return the connection to the pool"""
+        for cursor in self._prepared.values():
+            cursor.close()
+        self._cursor.close()
+        self.connection.close()
 
 
 class Student:
@@ -72,21 +373,31 @@ class Student:
     def get_all():
         """Get all students"""
         query = "SELECT * FROM students ORDER BY name"
-        return Database.execute_query(query)
+        # Cached loads read committed data in their own session, on the
+        # primary: a roster from a lagging replica could be cached under the
+        # version of a write it does not include, and stay for the full TTL
+        def load():
+            with Database.session(join=False) as session:
+                return session.query(query)
+        
+        return QueryCache.get_or_load('students:all', ('students',), load)
     
     @staticmethod
-    def get_by_id(student_id):
-        """Get student by ID"""
+    def get_by_id(student_id, for_update=False):
+        """Get student by ID (for_update locks the row until the session ends)"""
         query = "SELECT * FROM students WHERE id = %s"
-        result = Database.execute_query(query, (student_id,))
-        return result[0] if result else None
+        if for_update:
+            query += " FOR UPDATE"
+        with Database.session(read_only=not for_update) as session:
+            return session.query_one(query, (student_id,))
     
     @staticmethod
     def get_by_barcode(barcode_id):
         """Get student by barcode ID"""
         query = "SELECT * FROM students WHERE barcode_id = %s"
-        result = Database.execute_query(query, (barcode_id,))
-        return result[0] if result else None
+        # Used by the scan path, which stays on the primary
+        with Database.session() as session:
+            return session.query_one(query, (barcode_id,))
     
     @staticmethod
     def create(barcode_id, name, class_name, email=None, phone=None):
@@ -95,11 +406,30 @@ class Student:
             INSERT INTO students (barcode_id, name, class, email, phone)
             VALUES (%s, %s, %s, %s, %s)
         """
-        return Database.execute_query(
-            query, 
-            (barcode_id, name, class_name, email, phone),
-            fetch=False
-        )
+        with Database.session() as session:
+            student_id = session.execute(query, (barcode_id, name, class_name, email, phone))
+            session.invalidate('students')
+        return student_id
+    
+    @staticmethod
+    def create_many(students):
+        """Create several students in one batched INSERT
+        
+        students is a list of dictionaries with barcode_id, name, class and
+        optional email and phone. Returns the number of students created.
+        """
+        query = """
+            INSERT INTO students (barcode_id, name, class, email, phone)
+            VALUES (%s, %s, %s, %s, %s)
+        """
+        rows = [
+            (s['barcode_id'], s['name'], s['class'], s.get('email'), s.get('phone'))
+            for s in students
+        ]
+        with Database.session() as session:
+            created = session.executemany(query, rows)
+            session.invalidate('students')
+        return created
     
     @staticmethod
     def update(student_id, barcode_id, name, class_name, email=None, phone=None):
@@ -109,18 +439,21 @@ class Student:
             SET barcode_id = %s, name = %s, class = %s, email = %s, phone = %s
             WHERE id = %s
         """
-        Database.execute_query(
-            query,
-            (barcode_id, name, class_name, email, phone, student_id),
-            fetch=False
-        )
+        with Database.session() as session:
+            session.execute(query, (barcode_id, name, class_name, email, phone, student_id))
+            session.invalidate('students')
         return True
     
     @staticmethod
     def delete(student_id):
         """Delete student"""
         query = "DELETE FROM students WHERE id = %s"
-        Database.execute_query(query, (student_id,), fetch=False)
+        with Database.session() as session:
+            # Archived rows have no foreign key to cascade from
+            session.execute("DELETE FROM attendance_archive WHERE student_id = %s", (student_id,))
+            session.execute(query, (student_id,))
+            # Attendance rows are removed by ON DELETE CASCADE
+            session.invalidate('students', 'attendance')
         return True
     
     @staticmethod
@@ -132,7 +465,8 @@ class Student:
             ORDER BY name
         """
         search_term = f"%{keyword}%"
-        return Database.execute_query(query, (search_term, search_term, search_term))
+        with Database.session(read_only=True) as session:
+            return session.query(query, (search_term, search_term, search_term))
 
 
 class Attendance:
@@ -144,33 +478,23 @@ class Attendance:
         today = date.today()
         current_time = datetime.now().time()
         
-        # Check if already marked today
-        check_query = """
-            SELECT id FROM attendance 
-            WHERE student_id = %s AND date = %s
+        # A single upsert: a second scan of the same barcode updates the row
+        # instead of racing the first one. LAST_INSERT_ID(id) makes
+        # lastrowid return the existing row's ID on update. Scans do not
+        # invalidate the 'attendance' cache namespace: that would put every
+        # worker's scans on one cache_versions row and empty the statistics
+        # cache all through the morning rush, so statistics use a short TTL.
+        query = """
+            INSERT INTO attendance (student_id, date, time, status)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                id = LAST_INSERT_ID(id),
+                time = VALUES(time),
+                status = VALUES(status)
         """
-        existing = Database.execute_query(check_query, (student_id, today))
-        
-        if existing:
-            # Update existing record
-            query = """
-                UPDATE attendance 
-                SET time = %s, status = %s
-                WHERE student_id = %s AND date = %s
-            """
-            Database.execute_query(query, (current_time, status, student_id, today), fetch=False)
-            return existing[0]['id']
-        else:
-            # Insert new record
-            query = """
-                INSERT INTO attendance (student_id, date, time, status)
-                VALUES (%s, %s, %s, %s)
-            """
-            return Database.execute_query(
-                query,
-                (student_id, today, current_time, status),
-                fetch=False
-            )
+        with Database.session() as session:
+            attendance_id = session.execute(query, (student_id, today, current_time, status))
+        return attendance_id
     
     @staticmethod
     def get_today_attendance():
@@ -187,14 +511,15 @@ class Attendance:
                 a.created_at
             FROM attendance a
             INNER JOIN students s ON a.student_id = s.id
-            WHERE a.date = CURDATE()
+            WHERE a.date = CURDATE() AND a.status <> 'absent'
             ORDER BY a.time DESC
         """
-        return Database.execute_query(query)
+        with Database.session(read_only=True) as session:
+            return session.query(query)
     
     @staticmethod
     def get_by_date(target_date):
-        """Get attendance records for a specific date"""
+        """Get attendance records (scans, not absences) for a specific date"""
         query = """
             SELECT 
                 a.id,
@@ -205,16 +530,20 @@ class Attendance:
                 a.time,
                 a.status,
                 a.created_at
-            FROM attendance a
+            FROM {table} a
             INNER JOIN students s ON a.student_id = s.id
-            WHERE a.date = %s
+            WHERE a.date = %s AND a.status <> 'absent'
             ORDER BY a.time DESC
         """
-        return Database.execute_query(query, (target_date,))
+        with Database.session(read_only=True) as session:
+            table = Attendance._table_for(session, target_date)
+            return session.query(query.format(table=table), (target_date,))
     
     @staticmethod
     def get_by_student(student_id):
         """Get all attendance records for a student"""
+        # One row per student per day (unique_attendance), so sorting by date
+        # alone gives the same order and can be read from that index
         query = """
             SELECT 
                 a.id,
@@ -222,40 +551,164 @@ class Attendance:
                 a.time,
                 a.status,
                 a.created_at
-            FROM attendance a
+            FROM {table} a
             WHERE a.student_id = %s
-            ORDER BY a.date DESC, a.time DESC
+            ORDER BY a.date DESC
+        """
+        # Archived rows are all older than current ones, so reading the
+        # tables newest first keeps the overall order without a UNION sort
+        records = []
+        with Database.session(read_only=True) as session:
+            for table in Attendance._tables_for(session):
+                records.extend(session.query(query.format(table=table), (student_id,)))
+        return records
+    
+    @staticmethod
+    def get_absent(target_date):
+        """Get students marked absent on a specific date"""
+        query = """
+            SELECT 
+                a.id,
+                s.barcode_id,
+                s.name,
+                s.class,
+                a.date,
+                a.status
+            FROM {table} a
+            INNER JOIN students s ON a.student_id = s.id
+            WHERE a.date = %s AND a.status = 'absent'
+        """
+        with Database.session(read_only=True) as session:
+            table = Attendance._table_for(session, target_date)
+            absent = session.query(query.format(table=table), (target_date,))
+        # One day's absences are few; sorting here keeps the query a pure
+        # index lookup instead of a filesort over the joined rows
+        absent.sort(key=lambda row: (row['class'], row['name']))
+        return absent
+    
+    @staticmethod
+    def mark_absences(target_date=None):
+        """Insert 'absent' rows for every student who did not scan on a date
+        
+        Runs one INSERT ... SELECT per class and commits after each class, so
+        an interrupted run can simply be started again. Students who already
+        have a row for the date, or who were added after it, are skipped,
+        which makes the job idempotent and safe for closing a missed day.
+        """
+        target_date = target_date or date.today()
+        if target_date > date.today():
+            raise ValueError("Cannot mark absences for a future date")
+        
+        insert_query = """
+            INSERT INTO attendance (student_id, date, time, status)
+            SELECT s.id, %s, CURTIME(), 'absent'
+            FROM students s
+            LEFT JOIN attendance a ON a.student_id = s.id AND a.date = %s
+            WHERE s.class = %s
+              AND s.created_at < %s + INTERVAL 1 DAY
+              AND a.id IS NULL
+            ON DUPLICATE KEY UPDATE student_id = attendance.student_id
         """
-        return Database.execute_query(query, (student_id,))
+        marked = 0
+        # Commits as it goes, so never as part of a caller's transaction
+        with Database.session(join=False) as session:
+            classes = session.query("SELECT DISTINCT class FROM students ORDER BY class")
+            for row in classes:
+                # Lock the boundary for this class's transaction so an archive
+                # run cannot move the date while absences are being added
+                if Attendance._table_for(session, target_date, lock=True) != 'attendance':
+                    raise ValueError("Cannot mark absences for an archived date")
+                # A scan that races the job keeps its own row (no-op on duplicate)
+                session.execute(
+                    insert_query,
+                    (target_date, target_date, row['class'], target_date),
+                    prepared=True
+                )
+                marked += session.rowcount
+                session.invalidate('attendance')
+                session.commit()
+        
+        return {
+            'date': target_date.isoformat(),
+            'classes': len(classes),
+            'marked_absent': marked
+        }
     
     @staticmethod
     def get_statistics():
         """Get attendance statistics"""
+        return QueryCache.get_or_load(
+            f'attendance:statistics:{date.today().isoformat()}',
+            ('students', 'attendance'),
+            Attendance._load_statistics,
+            ttl=Config.STATISTICS_CACHE_SECONDS
+        )
+    
+    @staticmethod
+    def _load_statistics():
+        """Run the statistics queries
+        
+        Statistics are polled by every dashboard, so unlike the roster they
+        are read from a replica: the lag check keeps it within
+        DB_REPLICA_MAX_LAG_SECONDS and entries only live for
+        STATISTICS_CACHE_SECONDS.
+        """
         queries = {
-            'today_count': "SELECT COUNT(*) as count FROM attendance WHERE date = CURDATE()",
+            'today_count': """
+                SELECT COUNT(*) as count FROM attendance
+                WHERE date = CURDATE() AND status <> 'absent'
+            """,
             'total_students': "SELECT COUNT(*) as count FROM students",
             'today_rate': """
                 SELECT 
                     COALESCE((COUNT(a.id) * 100.0 / NULLIF((SELECT COUNT(*) FROM students), 0)), 0) as rate
                 FROM attendance a
-                WHERE a.date = CURDATE()
+                WHERE a.date = CURDATE() AND a.status <> 'absent'
             """
         }
         
         stats = {}
-        for key, query in queries.items():
-            result = Database.execute_query(query)
-            if key == 'today_rate':
-                stats[key] = round(result[0]['rate'], 2) if result[0]['rate'] else 0
-            else:
-                stats[key] = result[0]['count']
+        with Database.session(read_only=True, join=False) as session:
+            for key, query in queries.items():
+                result = session.query_one(query)
+                if key == 'today_rate':
+                    stats[key] = round(result['rate'], 2) if result['rate'] else 0
+                else:
+                    stats[key] = result['count']
         
         return stats
     
     @staticmethod
     def get_date_range_report(start_date, end_date):
         """Get attendance report for date range"""
-        query = """
+        with Database.session(read_only=True) as session:
+            query, params = Attendance._date_range_report_query(session, start_date, end_date)
+            return session.query(query, params)
+    
+    @staticmethod
+    def iter_date_range_report(start_date, end_date):
+        """Yield the date range report row by row (for exports)
+        
+        Rows are streamed from the server instead of being loaded at once.
+        The generator has its own unpublished session, so sessions opened
+        while it is paused never join its busy connection.
+        """
+        with Database.session(read_only=True, join=False, publish=False) as session:
+            query, params = Attendance._date_range_report_query(session, start_date, end_date)
+            yield from session.stream(query, params)
+    
+    @staticmethod
+    def _date_range_report_query(session, start_date, end_date):
+        """Build the date range report query and its parameters"""
+        tables = Attendance._tables_for(session, start_date, end_date)
+        source = " UNION ALL ".join(
+            f"""
+                SELECT id, student_id, date FROM {table}
+                WHERE date BETWEEN %s AND %s AND status <> 'absent'
+            """
+            for table in tables
+        )
+        query = f"""
             SELECT 
                 s.barcode_id,
                 s.name,
@@ -263,12 +716,124 @@ class Attendance:
                 COUNT(a.id) as days_present,
                 GROUP_CONCAT(DATE_FORMAT(a.date, '%Y-%m-%d') ORDER BY a.date) as dates
             FROM students s
-            LEFT JOIN attendance a ON s.id = a.student_id 
-                AND a.date BETWEEN %s AND %s
+            LEFT JOIN ({source}) a ON s.id = a.student_id
             GROUP BY s.id, s.barcode_id, s.name, s.class
             ORDER BY s.name
         """
-        return Database.execute_query(query, (start_date, end_date))
+        return query, (start_date, end_date) * len(tables)
+    
+    # ==================== ARCHIVE ====================
+    
+    @staticmethod
+    def get_archive_boundary():
+        """Get the date before which attendance lives in attendance_archive
+        
+        Returns None while nothing has been archived.
+        """
+        with Database.session(read_only=True) as session:
+            return Attendance._archive_boundary(session)
+    
+    @staticmethod
+    def _archive_boundary(session, lock=False):
+        """Read the archive boundary in session's transaction
+        
+        Queries routed by date read the boundary in the same transaction
+        (and so the same snapshot, on the same server) as the attendance
+        rows, so they never miss rows that an archive run has moved. lock
+        holds a shared lock on it until the transaction ends.
+        """
+        query = "SELECT archived_before FROM archive_state WHERE id = 1"
+        if lock:
+            query += " FOR SHARE"
+        row = session.query_one(query)
+        return row['archived_before'] if row else None
+    
+    @staticmethod
+    def _table_for(session, target_date, lock=False):
+        """Table holding attendance for a single date"""
+        boundary = Attendance._archive_boundary(session, lock)
+        if boundary is not None and target_date < boundary:
+            return 'attendance_archive'
+        return 'attendance'
+    
+    @staticmethod
+    def _tables_for(session, start_date=None, end_date=None):
+        """Tables holding attendance between two dates (open-ended if None), newest first"""
+        boundary = Attendance._archive_boundary(session)
+        if boundary is None:
+            return ['attendance']
+        tables = []
+        if end_date is None or end_date >= boundary:
+            tables.append('attendance')
+        if start_date is None or start_date < boundary:
+            tables.append('attendance_archive')
+        return tables
+    
+    @staticmethod
+    def archive(before=None):
+        """Move attendance dated before a day into attendance_archive
+        
+        Defaults to the start of the current academic year. Rows are moved
+        one month per transaction, oldest first, and the archive boundary is
+        advanced in the same transaction, so queries that read the boundary
+        in their own transaction (see _archive_boundary) always find every
+        row and an interrupted run can simply be started again.
+        """
+        before = before or academic_year_start(date.today())
+        if before > date.today():
+            raise ValueError("Cannot archive attendance from the future")
+        
+        move_query = """
+            INSERT INTO attendance_archive (id, student_id, date, time, status, created_at)
+            SELECT id, student_id, date, time, status, created_at
+            FROM attendance
+            WHERE date < %s
+        """
+        delete_query = "DELETE FROM attendance WHERE date < %s"
+        boundary_query = """
+            UPDATE archive_state
+            SET archived_before = GREATEST(COALESCE(archived_before, %s), %s)
+            WHERE id = 1
+        """
+        
+        moved = 0
+        # Commits as it goes, so never as part of a caller's transaction
+        with Database.session(join=False) as session:
+            oldest = session.query_one("SELECT MIN(date) AS oldest FROM attendance")['oldest']
+            chunk_end = oldest
+            while chunk_end is not None and chunk_end < before:
+                # First day of the next month, capped at the boundary
+                chunk_end = min(
+                    date(chunk_end.year + chunk_end.month // 12, chunk_end.month % 12 + 1, 1),
+                    before
+                )
+                # Boundary first: mark_absences locks it before writing, so
+                # both take the locks in the same order
+                session.execute(boundary_query, (chunk_end, chunk_end), prepared=True)
+                session.execute(move_query, (chunk_end,), prepared=True)
+                moved += session.rowcount
+                session.execute(delete_query, (chunk_end,), prepared=True)
+                session.invalidate('attendance')
+                session.commit()
+            
+            # Nothing (left) to move: still record the boundary
+            session.execute(boundary_query, (before, before))
+        
+        return {
+            'archived_before': before.isoformat(),
+            'moved': moved
+        }
+
+
+def fetch_cache_versions():
+    """Read the cache version stamps committed by every process"""
+    placeholders = ', '.join(['%s'] * len(NAMESPACES))
+    query = f"SELECT namespace, version FROM cache_versions WHERE namespace IN ({placeholders})"
+    with Database.session(join=False) as session:
+        return {row['namespace']: row['version'] for row in session.query(query, NAMESPACES)}
+
+
+CacheVersions.fetch = fetch_cache_versions
 
 
 # Initialize database pool when module is imported
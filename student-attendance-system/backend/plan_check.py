@@ -0,0 +1,282 @@
+"""
+Query plan regression checks for Student Attendance System
+
+Builds a scratch database from the migrations, seeds it with a realistic
+amount of data, runs every public Student and Attendance method, and
+EXPLAINs each statement the method executed. A full table scan or a
+filesort in a hot-path method fails the check, as does a model method
+that has no entry in CHECKS:
+
+    python backend/plan_check.py            # exit status 1 on a regression
+    python backend/plan_check.py --keep     # keep the scratch database
+
+The same checks run under pytest (tests/test_query_plans.py), which skips
+them when no MySQL server is reachable. The scratch database is named
+<DB_NAME>_plan_check and is dropped and recreated on every run.
+"""
+import argparse
+import functools
+import inspect
+import os
+import sys
+from datetime import date, timedelta
+
+import mysql.connector
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+import migrate
+
+
+SEED_STUDENTS = 2000
+SEED_CLASSES = 20
+SEED_DAYS = 60
+
+TODAY = date.today()
+ARCHIVE_BEFORE = TODAY - timedelta(days=SEED_DAYS // 2)
+
+# (model method, call, hot path)
+CHECKS = [
+    ('Student.get_all', lambda m: m.Student.get_all(), False),
+    ('Student.get_by_id', lambda m: m.Student.get_by_id(1), True),
+    ('Student.get_by_barcode', lambda m: m.Student.get_by_barcode('PLAN000001'), True),
+    ('Student.create', lambda m: m.Student.create('PLANNEW001', 'New Student', 'Class 1'), True),
+    ('Student.create_many', lambda m: m.Student.create_many([
+        {'barcode_id': 'PLANNEW002', 'name': 'New Student 2', 'class': 'Class 2'},
+        {'barcode_id': 'PLANNEW003', 'name': 'New Student 3', 'class': 'Class 3'},
+    ]), False),
+    ('Student.update', lambda m: m.Student.update(1, 'PLAN000001', 'Student 1', 'Class 1'), True),
+    ('Student.delete', lambda m: m.Student.delete(
+        m.Student.get_by_barcode('PLANNEW001')['id']
+    ), True),
+    ('Student.search', lambda m: m.Student.search('Student 12'), False),
+    ('Attendance.mark_attendance', lambda m: m.Attendance.mark_attendance(1), True),
+    ('Attendance.get_today_attendance', lambda m: m.Attendance.get_today_attendance(), True),
+    ('Attendance.get_by_date', lambda m: m.Attendance.get_by_date(TODAY - timedelta(days=1)), True),
+    ('Attendance.get_by_student', lambda m: m.Attendance.get_by_student(1), True),
+    ('Attendance.get_absent', lambda m: m.Attendance.get_absent(TODAY - timedelta(days=1)), True),
+    ('Attendance.mark_absences', lambda m: m.Attendance.mark_absences(TODAY), False),
+    ('Attendance.get_statistics', lambda m: m.Attendance.get_statistics(), True),
+    ('Attendance.get_date_range_report', lambda m: m.Attendance.get_date_range_report(
+        TODAY - timedelta(days=30), TODAY
+    ), False),
+    ('Attendance.iter_date_range_report', lambda m: list(m.Attendance.iter_date_range_report(
+        TODAY - timedelta(days=30), TODAY
+    )), False),
+    # Archive the older half of the seeded days, then read across the boundary
+    ('Attendance.archive', lambda m: m.Attendance.archive(ARCHIVE_BEFORE), False),
+    ('Attendance.get_archive_boundary', lambda m: m.Attendance.get_archive_boundary(), True),
+    ('Attendance.get_by_date', lambda m: m.Attendance.get_by_date(
+        ARCHIVE_BEFORE - timedelta(days=1)
+    ), True),
+    ('Attendance.get_by_student', lambda m: m.Attendance.get_by_student(1), True),
+    ('Attendance.get_date_range_report', lambda m: m.Attendance.get_date_range_report(
+        ARCHIVE_BEFORE - timedelta(days=15), ARCHIVE_BEFORE + timedelta(days=15)
+    ), False),
+]
+
+SEED_STUDENTS_QUERY = """
+    INSERT INTO students (barcode_id, name, class)
+    WITH RECURSIVE seq (n) AS (
+        SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s
+    )
+    SELECT CONCAT('PLAN', LPAD(n, 6, '0')), CONCAT('Student ', n), CONCAT('Class ', n MOD %s)
+    FROM seq
+"""
+
+# Most students scan on most days; some days are already closed as absent
+SEED_ATTENDANCE_QUERY = """
+    INSERT INTO attendance (student_id, date, time, status)
+    WITH RECURSIVE days (d) AS (
+        SELECT 1 UNION ALL SELECT d + 1 FROM days WHERE d < %s
+    )
+    SELECT
+        s.id,
+        CURDATE() - INTERVAL days.d DAY,
+        SEC_TO_TIME(28800 + (s.id * 37 + days.d * 11) MOD 7200),
+        IF((s.id + days.d) MOD 10 = 0, 'absent', 'present')
+    FROM students s
+    CROSS JOIN days
+    WHERE (s.id + days.d) MOD 7 <> 0
+"""
+
+
+def server_connection():
+    """Connect to the MySQL server without selecting a database"""
+    db_config = Config.get_db_config()
+    for key in ('pool_name', 'pool_size', 'database'):
+        db_config.pop(key)
+    return mysql.connector.connect(**db_config)
+
+
+def create_scratch_database(name):
+    """Create the scratch database from the migrations and seed it"""
+    connection = server_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+        cursor.execute(f"CREATE DATABASE `{name}` DEFAULT CHARSET utf8mb4")
+    finally:
+        cursor.close()
+        connection.close()
+
+    connection = migrate.connect(database=name)
+    try:
+        migrate.migrate(connection)
+
+        cursor = connection.cursor()
+        cursor.execute("SET SESSION cte_max_recursion_depth = %s", (max(SEED_STUDENTS, SEED_DAYS),))
+        cursor.execute(SEED_STUDENTS_QUERY, (SEED_STUDENTS, SEED_CLASSES))
+        cursor.execute(SEED_ATTENDANCE_QUERY, (SEED_DAYS,))
+        connection.commit()
+        cursor.execute("ANALYZE TABLE students, attendance")
+        cursor.fetchall()
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def drop_scratch_database(name):
+    connection = server_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def find_problems(plan):
+    """Return the full scans and filesorts in an EXPLAIN result"""
+    problems = []
+    for row in plan:
+        # The INSERT target row is reported as ALL even though nothing is read
+        if row['select_type'] == 'INSERT':
+            continue
+        extra = row['Extra'] or ''
+        if row['type'] == 'ALL':
+            problems.append(f"full scan of {row['table']}")
+        if 'filesort' in extra:
+            problems.append(f"filesort on {row['table']}")
+    return problems
+
+
+def model_methods(models):
+    """Names of every public Student and Attendance method"""
+    names = set()
+    for model in (models.Student, models.Attendance):
+        for name, _ in inspect.getmembers(model, inspect.isfunction):
+            if not name.startswith('_'):
+                names.add(f'{model.__name__}.{name}')
+    return names
+
+
+def statement_recorders(session_class, statements):
+    """Replacements for the Session methods that run SQL
+    
+    Each one appends (query, params) to statements and then runs the
+    original method. Install them on session_class for the duration of
+    run_checks (monkeypatch.setattr in the test).
+    """
+    def recorder(method, many=False):
+        @functools.wraps(method)
+        def record(self, query, params=None, *args, **kwargs):
+            statements.append((query, params[0] if many and params else params))
+            return method(self, query, params, *args, **kwargs)
+        return record
+
+    return {
+        'query': recorder(session_class.query),
+        'execute': recorder(session_class.execute),
+        'executemany': recorder(session_class.executemany, many=True),
+        'stream': recorder(session_class.stream),
+    }
+
+
+def load_models(scratch):
+    """Import the models pointed at the scratch database
+    
+    Must run before anything else imports models.py, which opens its
+    connection pool on import.
+    """
+    Config.DB_NAME = scratch
+    Config.DB_REPLICAS = ''
+    import models
+    return models
+
+
+def run_checks(models, explain_connection, statements):
+    """Run every check and return the number of failures
+    
+    statements must collect the SQL run by the models (see
+    statement_recorders).
+    """
+    failures = 0
+
+    missing = model_methods(models) - {name for name, _, _ in CHECKS}
+    for name in sorted(missing):
+        print(f"✗ {name}: no plan check (add it to CHECKS)")
+        failures += 1
+
+    cursor = explain_connection.cursor(dictionary=True)
+    try:
+        for name, call, hot in CHECKS:
+            statements.clear()
+            # Cached methods must reach the database to be checked
+            models.QueryCache.clear()
+            call(models)
+
+            problems = []
+            for query, params in statements:
+                cursor.execute("EXPLAIN " + query, params or ())
+                problems.extend(find_problems(cursor.fetchall()))
+
+            if not problems:
+                print(f"✓ {name}")
+            elif hot:
+                print(f"✗ {name}: {', '.join(problems)}")
+                failures += 1
+            else:
+                print(f"· {name} (not a hot path): {', '.join(problems)}")
+    finally:
+        cursor.close()
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query plan regression checks')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database')
+    args = parser.parse_args()
+
+    scratch = f'{Config.DB_NAME}_plan_check'
+    create_scratch_database(scratch)
+
+    models = load_models(scratch)
+
+    statements = []
+    recorders = statement_recorders(models.Session, statements)
+    originals = {name: getattr(models.Session, name) for name in recorders}
+    for name, recorder in recorders.items():
+        setattr(models.Session, name, recorder)
+
+    explain_connection = migrate.connect(database=scratch)
+    try:
+        failures = run_checks(models, explain_connection, statements)
+    finally:
+        for name, original in originals.items():
+            setattr(models.Session, name, original)
+        explain_connection.close()
+        if not args.keep:
+            drop_scratch_database(scratch)
+
+    if failures:
+        print(f"\n✗ {failures} query plan check(s) failed")
+        sys.exit(1)
+    print("\n✓ All query plans OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,62 @@
 """
 API routes for Student Attendance System
 """
-from flask import Blueprint, request, jsonify
-from models import Student, Attendance
+from flask import Blueprint, request, jsonify, g, Response, stream_with_context
+from models import Database, Student, Attendance
+from config.config import Config
+from contextlib import ExitStack
 from datetime import datetime, date
+import csv
+import hmac
+import io
+import time
 
 # Create blueprint
 api = Blueprint('api', __name__, url_prefix='/api')
 
 
+# ==================== READ-YOUR-WRITES ====================
+
+# After a client writes, its reads go to the primary until any healthy
+# replica must have caught up (max allowed lag plus one lag check interval)
+PRIMARY_COOKIE = 'read_primary_until'
+PRIMARY_STICKY_SECONDS = Config.DB_REPLICA_MAX_LAG_SECONDS + Config.DB_REPLICA_LAG_CHECK_SECONDS
+
+
+@api.before_request
+def pin_reads_after_writes():
+    """Route reads to the primary for clients that wrote recently"""
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    
+    if request.method != 'GET' or primary_until > time.time():
+        g.primary_scope = ExitStack()
+        g.primary_scope.enter_context(Database.use_primary())
+
+
+@api.after_request
+def remember_writes(response):
+    """Mark clients that just wrote so their next reads see the write"""
+    if request.method != 'GET' and response.status_code < 400:
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            str(time.time() + PRIMARY_STICKY_SECONDS),
+            max_age=PRIMARY_STICKY_SECONDS,
+            httponly=True,
+            samesite='Lax'
+        )
+    return response
+
+
+@api.teardown_request
+def unpin_reads(error=None):
+    primary_scope = g.pop('primary_scope', None)
+    if primary_scope is not None:
+        primary_scope.close()
+
+
 # ==================== STUDENT ROUTES ====================
 
 @api.route('/students', methods=['GET'])
@@ -107,28 +155,72 @@ def create_student():
         }), 500
 
 
-@api.route('/students/<int:student_id>', methods=['PUT'])
-def update_student(student_id):
-    """Update student information"""
+@api.route('/students/bulk', methods=['POST'])
+def create_students_bulk():
+    """Create several students in one batch"""
     try:
         data = request.get_json()
         
-        # Check if student exists
-        student = Student.get_by_id(student_id)
-        if not student:
+        if not isinstance(data, list) or not data:
             return jsonify({
                 'success': False,
-                'message': 'Student not found'
-            }), 404
+                'message': 'Expected a non-empty list of students'
+            }), 400
         
-        Student.update(
-            student_id,
-            data.get('barcode_id', student['barcode_id']),
-            data.get('name', student['name']),
-            data.get('class', student['class']),
-            data.get('email', student['email']),
-            data.get('phone', student['phone'])
-        )
+        # Validate required fields
+        required_fields = ['barcode_id', 'name', 'class']
+        for index, student in enumerate(data):
+            if not isinstance(student, dict):
+                return jsonify({
+                    'success': False,
+                    'message': f'Student {index} must be an object'
+                }), 400
+            for field in required_fields:
+                if field not in student:
+                    return jsonify({
+                        'success': False,
+                        'message': f'Missing required field: {field} (student {index})'
+                    }), 400
+        
+        created = Student.create_many(data)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Students created successfully',
+            'created': created
+        }), 201
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
+@api.route('/students/<int:student_id>', methods=['PUT'])
+def update_student(student_id):
+    """Update student information"""
+    try:
+        data = request.get_json()
+        
+        # Lock the row so the update starts from current data
+        with Database.session():
+            # Check if student exists
+            student = Student.get_by_id(student_id, for_update=True)
+            if not student:
+                return jsonify({
+                    'success': False,
+                    'message': 'Student not found'
+                }), 404
+            
+            Student.update(
+                student_id,
+                data.get('barcode_id', student['barcode_id']),
+                data.get('name', student['name']),
+                data.get('class', student['class']),
+                data.get('email', student['email']),
+                data.get('phone', student['phone'])
+            )
         
         return jsonify({
             'success': True,
@@ -146,15 +238,16 @@ def update_student(student_id):
 def delete_student(student_id):
     """Delete student"""
     try:
-        # Check if student exists
-        student = Student.get_by_id(student_id)
-        if not student:
-            return jsonify({
-                'success': False,
-                'message': 'Student not found'
-            }), 404
-        
-        Student.delete(student_id)
+        with Database.session():
+            # Check if student exists
+            student = Student.get_by_id(student_id, for_update=True)
+            if not student:
+                return jsonify({
+                    'success': False,
+                    'message': 'Student not found'
+                }), 404
+            
+            Student.delete(student_id)
         
         return jsonify({
             'success': True,
@@ -207,17 +300,18 @@ def mark_attendance():
                 'message': 'Barcode ID required'
             }), 400
         
-        # Get student by barcode
-        student = Student.get_by_barcode(data['barcode_id'])
-        if not student:
-            return jsonify({
-                'success': False,
-                'message': 'Student not found'
-            }), 404
-        
-        # Mark attendance
-        status = data.get('status', 'present')
-        attendance_id = Attendance.mark_attendance(student['id'], status)
+        with Database.session():
+            # Get student by barcode
+            student = Student.get_by_barcode(data['barcode_id'])
+            if not student:
+                return jsonify({
+                    'success': False,
+                    'message': 'Student not found'
+                }), 404
+            
+            # Mark attendance
+            status = data.get('status', 'present')
+            attendance_id = Attendance.mark_attendance(student['id'], status)
         
         return jsonify({
             'success': True,
@@ -280,15 +374,16 @@ def get_attendance_by_date(date_str):
 def get_student_attendance(student_id):
     """Get all attendance records for a student"""
     try:
-        # Check if student exists
-        student = Student.get_by_id(student_id)
-        if not student:
-            return jsonify({
-                'success': False,
-                'message': 'Student not found'
-            }), 404
-        
-        attendance = Attendance.get_by_student(student_id)
+        with Database.session(read_only=True):
+            # Check if student exists
+            student = Student.get_by_id(student_id)
+            if not student:
+                return jsonify({
+                    'success': False,
+                    'message': 'Student not found'
+                }), 404
+            
+            attendance = Attendance.get_by_student(student_id)
         
         return jsonify({
             'success': True,
@@ -304,6 +399,65 @@ def get_student_attendance(student_id):
         }), 500
 
 
+@api.route('/attendance/absences', methods=['POST'])
+def mark_absences():
+    """Mark every student without a scan as absent (body: optional date YYYY-MM-DD)"""
+    data = request.get_json(silent=True) or {}
+    
+    target_date = date.today()
+    if data.get('date'):
+        try:
+            target_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'message': 'Invalid date format. Use YYYY-MM-DD'
+            }), 400
+    
+    try:
+        result = Attendance.mark_absences(target_date)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Absences marked successfully',
+            'data': result
+        }), 200
+    except ValueError as e:
+        # Future or archived date
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
+@api.route('/attendance/absent/<date_str>', methods=['GET'])
+def get_absent(date_str):
+    """Get students marked absent on a date (format: YYYY-MM-DD)"""
+    try:
+        target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+        absent = Attendance.get_absent(target_date)
+        
+        return jsonify({
+            'success': True,
+            'data': absent
+        }), 200
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid date format. Use YYYY-MM-DD'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
 @api.route('/attendance/statistics', methods=['GET'])
 def get_statistics():
     """Get attendance statistics"""
@@ -366,6 +520,57 @@ def get_report():
         }), 500
 
 
+@api.route('/attendance/report/export', methods=['GET'])
+def export_report():
+    """Download the attendance report for a date range as CSV"""
+    try:
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        
+        if not start_date or not end_date:
+            return jsonify({
+                'success': False,
+                'message': 'start_date and end_date required (format: YYYY-MM-DD)'
+            }), 400
+        
+        # Parse dates
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        
+        if start > end:
+            return jsonify({
+                'success': False,
+                'message': 'start_date must be before end_date'
+            }), 400
+        
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid date format. Use YYYY-MM-DD'
+        }), 400
+    
+    columns = ['barcode_id', 'name', 'class', 'days_present', 'dates']
+    
+    def generate():
+        # Rows are written as they arrive instead of building the whole report
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for row in Attendance.iter_date_range_report(start, end):
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        yield buffer.getvalue()
+    
+    filename = f'attendance_{start_date}_{end_date}.csv'
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
 # ==================== HEALTH CHECK ====================
 
 @api.route('/health', methods=['GET'])
@@ -375,4 +580,28 @@ def health_check():
         'success': True,
         'message': 'API is running',
         'timestamp': datetime.now().isoformat()
+    }), 200
+
+
+@api.route('/ops/database', methods=['GET'])
+def database_stats():
+    """Query routing counters and replica health (requires OPS_TOKEN)"""
+    # Replica addresses and lag are not for the public: the endpoint only
+    # exists when a token is configured
+    if not Config.OPS_TOKEN:
+        return jsonify({
+            'success': False,
+            'message': 'Resource not found'
+        }), 404
+    
+    expected = f'Bearer {Config.OPS_TOKEN}'
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+        return jsonify({
+            'success': False,
+            'message': 'Unauthorized'
+        }), 401
+    
+    return jsonify({
+        'success': True,
+        'data': Database.get_routing_stats()
     }), 200
\ No newline at end of file
@@ -14,6 +14,12 @@ class Config:
     DEBUG = os.getenv('DEBUG', 'True') == 'True'
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
+    # Bearer token for the /api/ops endpoints (disabled when empty)
+    OPS_TOKEN = os.getenv('OPS_TOKEN', '')
+    
+    # Production server settings (backend/gunicorn.conf.py)
+    WORKERS = int(os.getenv('WORKERS', os.cpu_count() or 1))
+    WORKER_THREADS = int(os.getenv('WORKER_THREADS', 8))
     
     # MySQL Database settings
     DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -22,10 +28,29 @@ class Config:
     DB_PASSWORD = os.getenv('DB_PASSWORD', 'password')
     DB_NAME = os.getenv('DB_NAME', 'student_attendance')
     
-    # Database connection pool settings
+    # In-process caches: how often to re-read the cache_versions table, and
+    # the longest a cached result is served
+    CACHE_VERSION_POLL_SECONDS = float(os.getenv('CACHE_VERSION_POLL_SECONDS', 1))
+    CACHE_TTL_SECONDS = float(os.getenv('CACHE_TTL_SECONDS', 60))
+    # Statistics are not invalidated by scans, only refreshed this often
+    STATISTICS_CACHE_SECONDS = float(os.getenv('STATISTICS_CACHE_SECONDS', 5))
+    
+    # Month (1-12) in which the academic year starts; earlier years can be archived
+    ACADEMIC_YEAR_START_MONTH = int(os.getenv('ACADEMIC_YEAR_START_MONTH', 6))
+    
+    # Database connection pool settings (gunicorn workers size their own)
     DB_POOL_SIZE = 5
     DB_POOL_NAME = 'attendance_pool'
     
+    # Read replicas as comma-separated host[:port] list (same user/database)
+    DB_REPLICAS = os.getenv('DB_REPLICAS', '')
+    # Seconds to route around a replica after it fails
+    DB_REPLICA_RETRY_SECONDS = int(os.getenv('DB_REPLICA_RETRY_SECONDS', 30))
+    # Replicas further behind than this (or with replication stopped) are skipped;
+    # lag is checked at most every DB_REPLICA_LAG_CHECK_SECONDS per replica
+    DB_REPLICA_MAX_LAG_SECONDS = int(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 10))
+    DB_REPLICA_LAG_CHECK_SECONDS = int(os.getenv('DB_REPLICA_LAG_CHECK_SECONDS', 5))
+    
     @staticmethod
     def get_db_config():
         """Returns database configuration as dictionary"""
@@ -38,6 +63,24 @@ class Config:
             'pool_name': Config.DB_POOL_NAME,
             'pool_size': Config.DB_POOL_SIZE
         }
+    
+    @staticmethod
+    def get_replica_configs():
+        """Returns a database configuration dictionary for each read replica"""
+        replicas = []
+        for index, address in enumerate(Config.DB_REPLICAS.split(',')):
+            address = address.strip()
+            if not address:
+                continue
+            host, _, port = address.partition(':')
+            replica_config = Config.get_db_config()
+            replica_config.update({
+                'host': host,
+                'port': int(port) if port else Config.DB_PORT,
+                'pool_name': f'{Config.DB_POOL_NAME}_replica_{index}'
+            })
+            replicas.append(replica_config)
+        return replicas
 
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,71 @@
+-- Migration 001: initial schema
+-- Tables and views as originally shipped in database/schema.sql
+
+-- Students table
+CREATE TABLE IF NOT EXISTS students (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    barcode_id VARCHAR(50) UNIQUE NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    class VARCHAR(50) NOT NULL,
+    email VARCHAR(100),
+    phone VARCHAR(20),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_barcode (barcode_id),
+    INDEX idx_class (class)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Attendance table
+CREATE TABLE IF NOT EXISTS attendance (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    student_id INT NOT NULL,
+    date DATE NOT NULL,
+    time TIME NOT NULL,
+    status ENUM('present', 'absent', 'late') DEFAULT 'present',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+    INDEX idx_student (student_id),
+    INDEX idx_date (date),
+    INDEX idx_status (status),
+    UNIQUE KEY unique_attendance (student_id, date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Admin users table (optional for future authentication)
+CREATE TABLE IF NOT EXISTS admin_users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP NULL,
+    INDEX idx_username (username)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- View to get attendance summary
+CREATE OR REPLACE VIEW attendance_summary AS
+SELECT 
+    s.id,
+    s.barcode_id,
+    s.name,
+    s.class,
+    COUNT(a.id) as total_days_present,
+    MAX(a.date) as last_attendance_date
+FROM students s
+LEFT JOIN attendance a ON s.id = a.student_id
+GROUP BY s.id, s.barcode_id, s.name, s.class;
+
+-- View to get today's attendance
+CREATE OR REPLACE VIEW todays_attendance AS
+SELECT 
+    a.id,
+    s.barcode_id,
+    s.name,
+    s.class,
+    a.date,
+    a.time,
+    a.status,
+    a.created_at
+FROM attendance a
+INNER JOIN students s ON a.student_id = s.id
+WHERE a.date = CURDATE()
+ORDER BY a.time DESC;
@@ -0,0 +1,16 @@
+-- Migration 002: attendance indexes for the hot queries
+--
+-- (date, time) serves today's list and the by-date list, which filter on
+-- date and sort on time, without a filesort. idx_date is its prefix,
+-- idx_student is a prefix of unique_attendance, and idx_status is too
+-- unselective to be used.
+--
+-- A single ALTER is atomic and in place: it does not block reads or writes
+-- while it runs, and a failed run leaves the table unchanged.
+
+ALTER TABLE attendance
+    ADD INDEX idx_date_time (date, time),
+    DROP INDEX idx_date,
+    DROP INDEX idx_student,
+    DROP INDEX idx_status,
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,6 @@
+-- Migration 003: drop idx_barcode, which duplicates the UNIQUE key on
+-- students.barcode_id
+
+ALTER TABLE students
+    DROP INDEX idx_barcode,
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,16 @@
+-- Migration 004: archive table for closed academic years
+--
+-- backend/jobs.py archive moves attendance dated before a boundary into
+-- attendance_archive. attendance cannot be range-partitioned instead
+-- because MySQL does not support partitioning tables with foreign keys.
+
+CREATE TABLE IF NOT EXISTS attendance_archive (
+    id INT PRIMARY KEY,
+    student_id INT NOT NULL,
+    date DATE NOT NULL,
+    time TIME NOT NULL,
+    status ENUM('present', 'absent', 'late') DEFAULT 'present',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_date_time (date, time),
+    UNIQUE KEY unique_attendance (student_id, date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 ROW_FORMAT=COMPRESSED;
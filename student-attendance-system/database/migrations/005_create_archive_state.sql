@@ -0,0 +1,10 @@
+-- Migration 005: archive boundary
+-- Rows dated before archived_before live in attendance_archive; the models
+-- route queries by date, so current-term queries only read attendance.
+
+CREATE TABLE IF NOT EXISTS archive_state (
+    id TINYINT PRIMARY KEY,
+    archived_before DATE NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO archive_state (id, archived_before) VALUES (1, NULL);
@@ -0,0 +1,18 @@
+-- Migration 006: attendance_summary counts present days only and includes
+-- archived attendance
+
+CREATE OR REPLACE VIEW attendance_summary AS
+SELECT 
+    s.id,
+    s.barcode_id,
+    s.name,
+    s.class,
+    COUNT(a.student_id) as total_days_present,
+    MAX(a.date) as last_attendance_date
+FROM students s
+LEFT JOIN (
+    SELECT student_id, date FROM attendance WHERE status <> 'absent'
+    UNION ALL
+    SELECT student_id, date FROM attendance_archive WHERE status <> 'absent'
+) a ON s.id = a.student_id
+GROUP BY s.id, s.barcode_id, s.name, s.class;
@@ -0,0 +1,17 @@
+-- Migration 007: todays_attendance lists scans only, not the absent rows
+-- added by the end-of-day absence job
+
+CREATE OR REPLACE VIEW todays_attendance AS
+SELECT 
+    a.id,
+    s.barcode_id,
+    s.name,
+    s.class,
+    a.date,
+    a.time,
+    a.status,
+    a.created_at
+FROM attendance a
+INNER JOIN students s ON a.student_id = s.id
+WHERE a.date = CURDATE() AND a.status <> 'absent'
+ORDER BY a.time DESC;
@@ -0,0 +1,12 @@
+-- Migration 008: cache version stamps
+-- Every committed write bumps the version of the data it touched, so each
+-- app process and host can tell when its in-process caches are stale.
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    namespace VARCHAR(32) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO cache_versions (namespace) VALUES
+('students'),
+('attendance');
@@ -0,0 +1,8 @@
+-- Migration 009: (date, status) index for the absent list
+--
+-- Absent students for a date are read by date and status, whether the
+-- absence came from the end-of-day job or was marked by hand.
+
+ALTER TABLE attendance
+    ADD INDEX idx_date_status (date, status),
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,6 @@
+-- Migration 010: (date, status) index on attendance_archive, so the absent
+-- list for an archived date is an index lookup too
+
+ALTER TABLE attendance_archive
+    ADD INDEX idx_date_status (date, status),
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -15,7 +15,6 @@ CREATE TABLE IF NOT EXISTS students (
     phone VARCHAR(20),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX idx_barcode (barcode_id),
     INDEX idx_class (class)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
@@ -28,12 +27,42 @@ CREATE TABLE IF NOT EXISTS attendance (
     status ENUM('present', 'absent', 'late') DEFAULT 'present',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-    INDEX idx_student (student_id),
-    INDEX idx_date (date),
-    INDEX idx_status (status),
+    INDEX idx_date_time (date, time),
+    INDEX idx_date_status (date, status),
     UNIQUE KEY unique_attendance (student_id, date)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Archived attendance for closed academic years (see backend/jobs.py archive)
+CREATE TABLE IF NOT EXISTS attendance_archive (
+    id INT PRIMARY KEY,
+    student_id INT NOT NULL,
+    date DATE NOT NULL,
+    time TIME NOT NULL,
+    status ENUM('present', 'absent', 'late') DEFAULT 'present',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_date_time (date, time),
+    INDEX idx_date_status (date, status),
+    UNIQUE KEY unique_attendance (student_id, date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 ROW_FORMAT=COMPRESSED;
+
+-- Rows dated before archived_before live in attendance_archive
+CREATE TABLE IF NOT EXISTS archive_state (
+    id TINYINT PRIMARY KEY,
+    archived_before DATE NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO archive_state (id, archived_before) VALUES (1, NULL);
+
+-- Cache version stamps, bumped by every committed write (see backend/cache.py)
+CREATE TABLE IF NOT EXISTS cache_versions (
+    namespace VARCHAR(32) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO cache_versions (namespace) VALUES
+('students'),
+('attendance');
+
 -- Admin users table (optional for future authentication)
 CREATE TABLE IF NOT EXISTS admin_users (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -45,6 +74,26 @@ CREATE TABLE IF NOT EXISTS admin_users (
     INDEX idx_username (username)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Schema migrations applied by backend/migrate.py
+-- This script already contains every migration in database/migrations/
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO schema_migrations (version, name) VALUES
+(1, '001_initial_schema.sql'),
+(2, '002_attendance_hot_path_indexes.sql'),
+(3, '003_drop_duplicate_barcode_index.sql'),
+(4, '004_create_attendance_archive.sql'),
+(5, '005_create_archive_state.sql'),
+(6, '006_attendance_summary_view.sql'),
+(7, '007_todays_attendance_view.sql'),
+(8, '008_create_cache_versions.sql'),
+(9, '009_attendance_date_status_index.sql'),
+(10, '010_attendance_archive_date_status_index.sql');
+
 -- Insert sample students
 INSERT INTO students (barcode_id, name, class, email, phone) VALUES
 ('STU2026001', 'Amit Kumar', 'Computer Science - A', 'amit.kumar@example.com', '9876543210'),
@@ -80,10 +129,14 @@ SELECT
     s.barcode_id,
     s.name,
     s.class,
-    COUNT(a.id) as total_days_present,
+    COUNT(a.student_id) as total_days_present,
     MAX(a.date) as last_attendance_date
 FROM students s
-LEFT JOIN attendance a ON s.id = a.student_id
+LEFT JOIN (
+    SELECT student_id, date FROM attendance WHERE status <> 'absent'
+    UNION ALL
+    SELECT student_id, date FROM attendance_archive WHERE status <> 'absent'
+) a ON s.id = a.student_id
 GROUP BY s.id, s.barcode_id, s.name, s.class;
 
 -- View to get today's attendance
@@ -99,5 +152,5 @@ SELECT
     a.created_at
 FROM attendance a
 INNER JOIN students s ON a.student_id = s.id
-WHERE a.date = CURDATE()
+WHERE a.date = CURDATE() AND a.status <> 'absent'
 ORDER BY a.time DESC;
\ No newline at end of file
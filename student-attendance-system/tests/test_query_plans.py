@@ -0,0 +1,48 @@
+"""
+Query plan regression test for Student Attendance System
+
+Runs the checks from backend/plan_check.py against a scratch database.
+Needs a MySQL server (configured as for the app, with CREATE DATABASE
+rights) and is skipped when none is reachable.
+"""
+import os
+import sys
+
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+mysql_connector = pytest.importorskip('mysql.connector')
+
+import plan_check
+from config.config import Config
+
+
+@pytest.fixture(scope='module')
+def scratch_database():
+    try:
+        plan_check.server_connection().close()
+    except mysql_connector.Error as e:
+        pytest.skip(f"MySQL server not available: {e}")
+
+    scratch = f'{Config.DB_NAME}_plan_check'
+    plan_check.create_scratch_database(scratch)
+    yield scratch
+    plan_check.drop_scratch_database(scratch)
+
+
+def test_query_plans(scratch_database, monkeypatch):
+    models = plan_check.load_models(scratch_database)
+
+    statements = []
+    for name, recorder in plan_check.statement_recorders(models.Session, statements).items():
+        monkeypatch.setattr(models.Session, name, recorder)
+
+    explain_connection = plan_check.migrate.connect(database=scratch_database)
+    try:
+        failures = plan_check.run_checks(models, explain_connection, statements)
+    finally:
+        explain_connection.close()
+
+    assert failures == 0, f"{failures} query plan check(s) failed (see output above)"